@@ -0,0 +1,61 @@
+import os
+import time
+from argparse import ArgumentParser
+from unittest import mock
+
+import run
+from test import load_instead_corpus
+from utils import script_dir_with
+
+
+def bench_corpus(repeat: int) -> float:
+    """
+    Time extracting every lint of `res/instead_corpus.json`, `repeat` times over.
+    """
+    declarations = ["\n".join(lint["declaration"]) for lint in load_instead_corpus()]
+    # former names come from the rust repository and have nothing to do with the rules, leave them out
+    with mock.patch.object(run, "get_lints_former_name", return_value={}):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for decl in declarations:
+                run.extract_lint_info_detail(decl, True)
+        return time.perf_counter() - start
+
+
+def bench_rust_src(rust_dir: str) -> float:
+    """
+    Time extracting every clippy and rustc lint from a cloned rust repository.
+    """
+    info = run.LintInfo("en", None, rust_dir=rust_dir, content=[])
+    start = time.perf_counter()
+    info.clippy_lints_info()
+    info.rustc_lints_info()
+    return time.perf_counter() - start
+
+
+def main():
+    app = ArgumentParser(
+        "Lint info extractor benchmark",
+        description="Time lint doc extraction over the rule corpus, and the whole lint set if rust is cloned"
+    )
+    app.add_argument(
+        "-n", "--repeat",
+        action="store",
+        type=int,
+        help="How many times to extract the rule corpus",
+        default=100,
+    )
+    args = app.parse_args()
+
+    corpus_time = bench_corpus(args.repeat)
+    print("rule corpus x{}: {:.3f}s".format(args.repeat, corpus_time))
+
+    rust_dir = script_dir_with("rust")
+    if os.path.isdir(rust_dir):
+        print("whole lint set: {:.3f}s".format(bench_rust_src(rust_dir)))
+    else:
+        print("skipping whole lint set, rust repository is not cloned, run `python3 run.py` first")
+
+
+if __name__ == "__main__":
+    main()
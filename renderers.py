@@ -1,6 +1,52 @@
 import mistune
 import re
 
+# Rust uses lines starting with "# " to hide irrelevant code in doc examples
+HIDDEN_CODE_PATTERN = re.compile(r"^# .*$", re.MULTILINE)
+
+# Clippy lint docs don't always use a `### Instead` header to introduce the correct usage,
+# these rules describe the other phrasings seen upstream, add new ones here.
+# Snapshots store the compiled patterns, so any edit here rejects snapshots made with the old rules,
+# also add a lint doc for new rules to `res/instead_corpus.json`.
+# Paragraphs under an example section containing any of these (case insensitive)
+INSTEAD_PARAGRAPH_KEYWORDS = [
+    "instead",
+    "be written",
+    "would be",
+    "could be",
+    "you must",
+]
+# Paragraphs under an example section that are exactly one of these (case insensitive)
+INSTEAD_PARAGRAPH_EXACT = [
+    "better:",
+    "after:",
+]
+# Comment lines inside a code block containing any of these,
+# which separates the bad usage from the correct one
+INSTEAD_COMMENT_KEYWORDS = [
+    "should be",
+    "can be",
+    "could be",
+]
+
+
+def _keywords_pattern(keywords: list) -> str:
+    return "|".join(re.escape(kw) for kw in keywords)
+
+
+INSTEAD_PARAGRAPH_PATTERN = re.compile(
+    r"{}|\A(?:{})\Z".format(
+        _keywords_pattern(INSTEAD_PARAGRAPH_KEYWORDS),
+        _keywords_pattern(INSTEAD_PARAGRAPH_EXACT),
+    ),
+    re.IGNORECASE,
+)
+INSTEAD_COMMENT_PATTERN = re.compile(
+    r"^//.*(?:{}).*$".format(_keywords_pattern(INSTEAD_COMMENT_KEYWORDS)),
+    re.MULTILINE,
+)
+
+
 class ClippyDocRenderer(mistune.HTMLRenderer):
     """
     Adjust the syntax of clippy lints doc
@@ -12,19 +58,7 @@ class ClippyDocRenderer(mistune.HTMLRenderer):
         # I NEED to find a better way... OR DO I?
         if self._under_example is None or not self._under_example:
             return super().paragraph(text)
-        lower_text = text.lower()
-        could_be_correct_example = False
-        for keyword in [
-            "instead",
-            "be written",
-            "would be",
-            "could be",
-            "you must",
-        ]:
-            if keyword in lower_text:
-                could_be_correct_example = True
-
-        if could_be_correct_example or lower_text in ["better:", "after:"]:
+        if INSTEAD_PARAGRAPH_PATTERN.search(text):
             return "<h3>Instead</h3>\n"
         return super().paragraph(text)
 
@@ -43,21 +77,14 @@ class ClippyDocRenderer(mistune.HTMLRenderer):
 
     def block_code(self, code: str, info=None) -> str:
         # get rid of code after "# ", because rust uses it to hide inrelevent code
-        pat = re.compile(r"^# .*$", re.MULTILINE)
-        code = pat.sub("", code)
+        code = HIDDEN_CODE_PATTERN.sub("", code)
         # Some clippy lint doc using a comment to indicate the correct usage,
         # instead of a `### Instead` header, idk why... Therefore they need to be splitted
-        splitter = ""
-        for comment_spliter_keywords in [ "should be", "can be", "could be" ]:
-            for line in code.splitlines():
-                if line.startswith("//") and comment_spliter_keywords in line:
-                    splitter = line
-                    break
+        splitter = INSTEAD_COMMENT_PATTERN.search(code)
         if splitter:
-            splited_code = code.split(splitter, 1)
             content = "{}<h3>Instead</h3>\n{}".format(
-                super().block_code(splited_code[0], info),
-                super().block_code(splited_code[1], info)
+                super().block_code(code[:splitter.start()], info),
+                super().block_code(code[splitter.end():], info)
             )
             return content
         else:
@@ -82,8 +109,7 @@ class RustcDocRenderer(mistune.HTMLRenderer):
 
     def block_code(self, code: str, info=None) -> str:
         # get rid of code after "# ", because rust uses it to hide inrelevent code
-        pat = re.compile(r"^# .*$", re.MULTILINE)
-        code = pat.sub("", code)
+        code = HIDDEN_CODE_PATTERN.sub("", code)
 
         return super().block_code(code, info)
 
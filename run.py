@@ -2,6 +2,7 @@
 import subprocess
 import shutil
 import os
+import pickle
 import pkg_resources
 import re
 from itertools import chain
@@ -12,8 +13,14 @@ import pandas as pd
 import mistune
 from bs4 import BeautifulSoup
 
-from renderers import ClippyDocRenderer, RustcDocRenderer
-from utils import err, ensure_cmd, ensure_path, Translator, script_dir_with
+from renderers import ClippyDocRenderer, RustcDocRenderer, INSTEAD_PARAGRAPH_PATTERN, INSTEAD_COMMENT_PATTERN
+from utils import err, warn, ensure_cmd, ensure_path, Translator, script_dir_with
+
+# bump this whenever the extracted lints info could change, i.e. the layout of `LintInfoDetail`,
+# the parsing in this file or the heuristics in `renderers.py`, so stale snapshots are rejected
+SNAPSHOT_VERSION = 2
+# the `Instead` rules are stored in snapshots too, so editing them invalidates old snapshots without a bump
+SNAPSHOT_RULES = [INSTEAD_PARAGRAPH_PATTERN.pattern, INSTEAD_COMMENT_PATTERN.pattern]
 
 class LintInfo:
     def __init__(self, lang: str, provider, rust_dir=None, content=[]):
@@ -49,7 +56,12 @@ class LintInfo:
     def gather_lint_info(self):
         self.content += self.clippy_lints_info()
         self.content += self.rustc_lints_info()
+        # keep the untranslated records, so later runs can skip extraction entirely
+        self.save_snapshot()
+        self.translate_lint_info()
+
 
+    def translate_lint_info(self):
         # translate if required
         if self.lang and self.lang.lower() != "en":
             cache_path = script_dir_with(
@@ -91,6 +103,72 @@ class LintInfo:
                 raise ex
 
 
+    def rust_commit(self) -> str:
+        """
+        Get the commit hash of the cloned rust repository.
+
+        Raises `subprocess.SubprocessError` if it cannot be determined.
+        """
+        proc = subprocess.run(
+            ["git", "-C", self.rust_dir, "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+        )
+        proc.check_returncode()
+        return proc.stdout.strip()
+
+
+    def save_snapshot(self, path=None):
+        """
+        Persist extracted lints info for the current rust commit under `temp/`,
+        so that it can be reloaded with `load_snapshot` without the rust source tree.
+
+        The snapshot is only a cache, failing to save it does not stop the run.
+        """
+        try:
+            commit = self.rust_commit()
+            if not path:
+                path = script_dir_with("temp", ".snapshot-{}".format(commit))
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "rules": SNAPSHOT_RULES,
+                "commit": commit,
+                "content": [vars(det) for det in self.content],
+            }
+            with open(path, "wb") as sf:
+                pickle.dump(snapshot, sf, protocol=5)
+            print("snapshot of {} lints saved to '{}'".format(len(self.content), path))
+        except (IOError, subprocess.SubprocessError, pickle.PicklingError) as ex:
+            warn(f"unable to save snapshot, skipping: {ex}")
+
+
+    def load_snapshot(self, path: str):
+        """
+        Load lints info previously stored by `save_snapshot`.
+        """
+        ensure_path(path)
+        try:
+            with open(path, "rb") as sf:
+                snapshot = _SnapshotUnpickler(sf).load()
+        # corrupted data can make pickle opcodes fail in many ways, e.g. `AttributeError`
+        # when appending to something that is not a list
+        except (IOError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError,
+                KeyError, IndexError, MemoryError, OverflowError) as ex:
+            err(f"unable to read snapshot: {ex}")
+        invalid_msg = f"snapshot at '{path}' is outdated or invalid, please re-run without `--from-snapshot`"
+        if not isinstance(snapshot, dict) \
+            or snapshot.get("version") != SNAPSHOT_VERSION \
+            or snapshot.get("rules") != SNAPSHOT_RULES:
+            err(invalid_msg)
+        try:
+            content = [LintInfoDetail(**det) for det in snapshot["content"]]
+            commit = snapshot["commit"]
+        except (KeyError, TypeError):
+            err(invalid_msg)
+        self.content = content
+        print("{} lints loaded from snapshot of rust commit '{}'".format(len(self.content), commit))
+
+
     def clippy_lints_info(self):
         """
         Retrive all clippy lints information.
@@ -175,6 +253,15 @@ class LintInfo:
             err("unsupported output format:", ext)
 
 
+class _SnapshotUnpickler(pickle.Unpickler):
+    """
+    Snapshots only hold builtin containers and strings, refuse to resolve any class
+    so that loading a crafted file cannot execute code.
+    """
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"unexpected object '{module}.{name}' in snapshot")
+
+
 def _lint_info_from_file_(file, is_clippy) -> list:
     try:
         details = []
@@ -331,6 +418,13 @@ def cli() -> ArgumentParser:
         help="Set a local path for result export",
         default="./result.xlsx"
     )
+    app.add_argument(
+        "--from-snapshot",
+        action="store",
+        metavar="PATH",
+        help="Load lints info from a snapshot saved under `temp/` by a previous run, \
+            instead of cloning and parsing rust source code"
+    )
 
     subcommands = app.add_subparsers(title="subcommands")
 
@@ -345,14 +439,24 @@ def cli() -> ArgumentParser:
 
 
 def main():
-    ensure_cmd("git")
-
     args = cli().parse_args()
+    if args.from_snapshot and (args.branch or args.force):
+        err("`--branch` and `--force` cannot be used with `--from-snapshot`")
 
-    dest_rust_dir = script_dir_with("rust")
     temp_dir = script_dir_with("temp")
     if not os.path.isdir(temp_dir):
         os.makedirs(temp_dir)
+
+    if args.from_snapshot:
+        info = LintInfo(args.lang, provider=args.provider)
+        info.load_snapshot(args.from_snapshot)
+        info.translate_lint_info()
+        info.export(args.output)
+        return
+
+    ensure_cmd("git")
+
+    dest_rust_dir = script_dir_with("rust")
     info = LintInfo(args.lang, provider=args.provider, rust_dir=dest_rust_dir)
 
     info.clone_rust_src(args.branch, args.force)
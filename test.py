@@ -1,5 +1,11 @@
 import unittest
+import os
+import json
+import pickle
+import tempfile
+from unittest import mock
 import run
+import renderers
 import utils
 
 class TestLintExtraction(unittest.TestCase):
@@ -155,6 +161,140 @@ and safe.""")
         )
 
 
+    def test_snapshot_roundtrip(self):
+        detail = run.LintInfoDetail("clippy::stutter", "summary", "example", "instead", "explanation", "")
+        info = run.LintInfo("en", "baidu", content=[detail])
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(run.LintInfo, "rust_commit", return_value="deadbeef"):
+            path = os.path.join(tmp, ".snapshot")
+            info.save_snapshot(path)
+            loaded = run.LintInfo("en", "baidu")
+            loaded.load_snapshot(path)
+        self.assertEqual(len(loaded.content), 1)
+        self.assertEqual(vars(loaded.content[0]), vars(detail))
+
+
+    def test_snapshot_save_failure_is_not_fatal(self):
+        info = run.LintInfo("en", "baidu", content=[])
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(run.LintInfo, "rust_commit", side_effect=run.subprocess.CalledProcessError(128, "git")), \
+                mock.patch.object(run, "warn") as warn:
+            path = os.path.join(tmp, ".snapshot")
+            info.save_snapshot(path)
+            self.assertFalse(os.path.exists(path))
+        warn.assert_called_once()
+
+
+    def test_snapshot_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            outdated = os.path.join(tmp, ".snapshot-outdated")
+            with open(outdated, "wb") as sf:
+                pickle.dump({"version": run.SNAPSHOT_VERSION - 1, "rules": run.SNAPSHOT_RULES, "commit": "", "content": []}, sf)
+            other_rules = os.path.join(tmp, ".snapshot-other-rules")
+            with open(other_rules, "wb") as sf:
+                pickle.dump({"version": run.SNAPSHOT_VERSION, "rules": ["instead", "should be"], "commit": "", "content": []}, sf)
+            missing_commit = os.path.join(tmp, ".snapshot-missing-commit")
+            with open(missing_commit, "wb") as sf:
+                pickle.dump({"version": run.SNAPSHOT_VERSION, "rules": run.SNAPSHOT_RULES, "content": []}, sf)
+            truncated = os.path.join(tmp, ".snapshot-truncated")
+            with open(truncated, "wb") as sf:
+                sf.write(pickle.dumps({"version": run.SNAPSHOT_VERSION, "commit": "", "content": []})[:10])
+            empty = os.path.join(tmp, ".snapshot-empty")
+            open(empty, "wb").close()
+            # snapshots must never resolve classes, this one would construct `LintInfoDetail` directly
+            with_class = os.path.join(tmp, ".snapshot-with-class")
+            with open(with_class, "wb") as sf:
+                detail = run.LintInfoDetail("clippy::stutter", "", "", "", "", "")
+                pickle.dump({"version": run.SNAPSHOT_VERSION, "commit": "", "content": [detail]}, sf)
+
+            for path in [outdated, other_rules, missing_commit, truncated, empty, with_class]:
+                with self.assertRaises(SystemExit):
+                    run.LintInfo("en", "baidu").load_snapshot(path)
+
+
+    def test_snapshot_rejects_clone_options(self):
+        for extra in [["-b", "master"], ["--force"]]:
+            argv = ["run.py", "--from-snapshot", "snapshot"] + extra
+            with mock.patch("sys.argv", argv), mock.patch.object(run.LintInfo, "load_snapshot") as load:
+                with self.assertRaises(SystemExit):
+                    run.main()
+            load.assert_not_called()
+
+
+def load_instead_corpus(kind=None) -> list:
+    """
+    Load the synthetic lint docs from `res/instead_corpus.json`, optionally only the ones
+    exercising the given kind of rules (`paragraph` or `comment`).
+    """
+    with open(utils.script_dir_with("res", "instead_corpus.json"), "r", encoding="utf8") as cf:
+        lints = json.load(cf)["lints"]
+    return [lint for lint in lints if kind is None or lint["kind"] == kind]
+
+
+class TestInsteadRules(unittest.TestCase):
+    # note the corpus is synthetic, it covers every rule in `renderers.py` but is not copied from upstream
+    def assert_corpus(self, corpus: list):
+        for lint in corpus:
+            with self.subTest(rule=lint["rule"]):
+                res = run.extract_lint_info_detail("\n".join(lint["declaration"]), True)
+                self.assertEqual(len(res), 1)
+                self.assertEqual(res[0].example, "\n".join(lint["example"]))
+                self.assertEqual(res[0].instead, "\n".join(lint["instead"]))
+
+
+    def test_paragraph_rules(self):
+        corpus = load_instead_corpus("paragraph")
+        self.assertEqual(
+            sorted(lint["rule"] for lint in corpus),
+            sorted(renderers.INSTEAD_PARAGRAPH_KEYWORDS + renderers.INSTEAD_PARAGRAPH_EXACT)
+        )
+        self.assert_corpus(corpus)
+
+
+    def test_paragraph_exact_rules(self):
+        self.assertTrue(renderers.INSTEAD_PARAGRAPH_PATTERN.search("After:"))
+        self.assertFalse(renderers.INSTEAD_PARAGRAPH_PATTERN.search("After:\n"))
+        self.assertFalse(renderers.INSTEAD_PARAGRAPH_PATTERN.search("Better: a loop"))
+
+
+    def test_comment_rules(self):
+        corpus = load_instead_corpus("comment")
+        self.assertEqual(sorted(lint["rule"] for lint in corpus), sorted(renderers.INSTEAD_COMMENT_KEYWORDS))
+        self.assert_corpus(corpus)
+
+
+    def test_comment_first_match_wins(self):
+        text = """
+declare_clippy_lint! {
+    /// ### What it does
+    /// Checks for transmutes from a pointer to a reference.
+    ///
+    /// ### Why is this bad?
+    /// This can always be rewritten with `&` and `*`.
+    ///
+    /// ### Example
+    /// ```rust
+    /// unsafe {
+    ///     let _: &T = std::mem::transmute(p); // where p: *const T
+    /// }
+    ///
+    /// // should be:
+    /// let _: &T = &*p;
+    ///
+    /// // could be:
+    /// let _: &T = &*(p as *const T);
+    /// ```
+    #[clippy::version = "pre 1.29.0"]
+    pub TRANSMUTE_PTR_TO_REF,
+    complexity,
+    "transmutes from a pointer to a reference type"
+}"""
+        res = run.extract_lint_info_detail(text, True)
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0].example, "unsafe {\n    let _: &T = std::mem::transmute(p); // where p: *const T\n}")
+        self.assertEqual(res[0].instead, "let _: &T = &*p;\n\n// could be:\nlet _: &T = &*(p as *const T);")
+
+
 if __name__ == "__main__":
     unittest.main()
 
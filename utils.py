@@ -14,6 +14,10 @@ def err(*msg: str, code=1, separator=" "):
     exit(code)
 
 
+def warn(*msg: str, separator=" "):
+    print("\x1b[33;1mwarning\x1b[0m: {}".format(f"{separator}".join(msg)), file=sys.stderr)
+
+
 def ensure_cmd(cmd: str):
     if shutil.which(cmd) is None:
         err(f"missing command '{cmd}', make sure it has been installed and added to PATH")